@@ -6,13 +6,34 @@ Part of productivity-skills/note-taking
 Handles note operations: add, search, update, index management
 """
 
+import codecs
+import functools
+import heapq
 import json
 import sys
 import os
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 import re
-from typing import List, Dict, Optional
+import shutil
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Advisory file locking (see _notes_lock)
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# Optional: faster JSON parsing/serialization (index and stdin)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configuration - can be overridden by environment variable
 # Default: Prefer OneDrive Documents if available, fall back to local Documents
@@ -31,6 +52,19 @@ DEFAULT_NOTES_DIR = get_default_notes_dir()
 NOTES_DIR = Path(os.environ.get('NOTES_DIR', DEFAULT_NOTES_DIR)).expanduser().resolve()
 INDEX_FILE = NOTES_DIR / '.index.json'
 CONFIG_FILE = NOTES_DIR / '.config.json'
+LOCK_FILE = NOTES_DIR / '.lock'
+INDEX_VERSION = 11  # Bump when the index record format changes
+
+# File header written at the top of each month file (not an entry)
+NOTES_HEADER_RE = re.compile(r'^Notes - \w+ \d{4}$')
+
+# Start of a top-level heading line (entry boundary)
+NEXT_HEADING_RE = re.compile(r'^# ', re.MULTILINE)
+
+# Keyword extraction for index records
+KEYWORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+COMMON_WORDS = frozenset({'the', 'and', 'for', 'that', 'with', 'this', 'from', 'have', 'was', 'were'})
+MAX_KEYWORDS = 10  # Keywords stored per index record
 
 def get_current_month_file() -> Path:
     """Get the current month's markdown file path"""
@@ -40,37 +74,61 @@ def get_current_month_file() -> Path:
     year_dir.mkdir(parents=True, exist_ok=True)
     return year_dir / f"{month_name}.md"
 
-def extract_entries(file_path: Path) -> List[Dict]:
-    """Extract all entries from a markdown file"""
-    if not file_path.exists():
-        return []
+def _iter_markdown_files() -> Iterator[os.DirEntry]:
+    """Yield all month files (YYYY/*.md), skipping hidden directories.
+
+    Uses os.scandir so is_dir/is_file come from the cached DirEntry data
+    instead of an extra stat() per entry. Order is unspecified.
+    """
+    try:
+        with os.scandir(NOTES_DIR) as years:
+            year_paths = [e.path for e in years
+                          if e.is_dir(follow_symlinks=False) and not e.name.startswith('.')]
+    except FileNotFoundError:
+        return
 
+    for year_path in year_paths:
+        with os.scandir(year_path) as files:
+            for entry in files:
+                if entry.name.endswith('.md') and entry.is_file():
+                    yield entry
+
+def extract_entries(file_path: Union[str, Path]) -> List[Dict]:
+    """Extract all entries from a markdown file"""
+    file_path = Path(file_path)
     entries = []
-    current_entry = None
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                # Check if line is a top-level heading (entry start)
-                stripped = line.lstrip()
-                if stripped.startswith('# ') and not stripped.startswith('## '):
-                    if current_entry:
-                        # Filter out file headers (e.g., "Notes - November 2025")
-                        if not re.match(r'^Notes - \w+ \d{4}$', current_entry['heading']):
-                            entries.append(current_entry)
-                    current_entry = {
-                        'heading': stripped.strip('# \n'),
-                        'content': '',
-                        'file': str(file_path.relative_to(NOTES_DIR)),
-                        'date': extract_date_from_file(file_path)
-                    }
-                elif current_entry:
-                    current_entry['content'] += line
-
-        if current_entry:
-            # Filter out file headers for the last entry too
-            if not re.match(r'^Notes - \w+ \d{4}$', current_entry['heading']):
-                entries.append(current_entry)
+        # Read and decode the whole file once (universal newlines)
+        text = file_path.read_text(encoding='utf-8')
+
+        # Split on top-level headings in a single pass. The leading newline
+        # lets a heading on the first line split like any other, and '\n# '
+        # never matches '## ' subheadings. chunks[0] is the preamble.
+        chunks = ('\n' + text).split('\n# ')
+        last = len(chunks) - 1
+        rel_path = str(file_path.relative_to(NOTES_DIR))
+        file_date = extract_date_from_file(file_path)
+        for i in range(1, len(chunks)):
+            heading, sep, body = chunks[i].partition('\n')
+            if sep and i < last:
+                # Restore the newline consumed by the split
+                body += '\n'
+
+            heading = heading.strip('# ')
+            # Filter out file headers (e.g., "Notes - November 2025"); the
+            # prefix test skips the regex for ordinary entry headings
+            if heading.startswith('Notes - ') and NOTES_HEADER_RE.match(heading):
+                continue
+
+            entries.append({
+                'heading': heading,
+                'content': body,
+                'file': rel_path,
+                'date': file_date
+            })
+    except FileNotFoundError:
+        return []
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
 
@@ -86,25 +144,65 @@ def extract_date_from_file(file_path: Path) -> str:
     except Exception:
         return datetime.now().strftime("%Y-%m-%d")
 
+@contextmanager
+def _notes_lock() -> Iterator[None]:
+    """Hold the exclusive advisory lock on the notes folder
+
+    add, append and replace read a month file (and the index), modify it
+    and write it back; the lock keeps a concurrent writer, such as a
+    background enrichment, from landing in between and being overwritten.
+    """
+    NOTES_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, 'a+b') as f:
+        if os.name == 'nt':
+            # Locks the first byte; retries for about 10 s before raising
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _exclusive(func):
+    """Run a note-writing command while holding _notes_lock()"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _notes_lock():
+            return func(*args, **kwargs)
+    return wrapper
+
+@_exclusive
 def add_note(heading: str, content: str, category: Optional[str] = None) -> Dict:
     """Add a new note entry to current month's file"""
     month_file = get_current_month_file()
-
-    # Ensure file exists
-    if not month_file.exists():
-        month_file.touch()
-        month_file.write_text("# Notes - " + datetime.now().strftime("%B %Y") + "\n\n")
+    try:
+        previous_stamp = _file_stamp(month_file.stat())
+    except FileNotFoundError:
+        previous_stamp = None
 
     # Format the entry with creation timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d")
     entry = f"\n# {heading}\n{content.strip()}\n\n**Created:** {timestamp}\n"
 
-    # Append to file
-    with open(month_file, 'a', encoding='utf-8') as f:
-        f.write(entry)
+    # New month file: write the file header together with the first entry
+    if previous_stamp is None:
+        entry = "# Notes - " + datetime.now().strftime("%B %Y") + "\n\n" + entry
+
+    # Append to file with a single O_APPEND write (atomic w.r.t. other appenders)
+    fd = os.open(month_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o666)
+    try:
+        os.write(fd, entry.encode('utf-8'))
+    finally:
+        os.close(fd)
     
-    # Update index
-    update_index()
+    # Update index for just this file
+    _refresh_index_file(month_file, previous_stamp)
     
     return {
         'status': 'success',
@@ -115,36 +213,67 @@ def add_note(heading: str, content: str, category: Optional[str] = None) -> Dict
 
 def search_notes(query: str, max_results: int = 10) -> List[Dict]:
     """Search for notes matching query across all files"""
-    results = []
+    matches = []
     query_lower = query.lower()
     query_terms = query_lower.split()
+    today = datetime.now().toordinal()
+
+    # Relevance of the best max_results matches so far (min-heap). Once it
+    # is full, its smallest value is the score an entry must reach to place.
+    top_scores = []
+    min_score = 0
+
+    for entry in _iter_search_entries():
+        relevance = calculate_relevance(entry, query_lower, query_terms, today, min_score)
+        if relevance > 0 and relevance >= min_score:
+            matches.append((relevance, entry['file'], entry))
+            if max_results > 0:
+                if len(top_scores) < max_results:
+                    heapq.heappush(top_scores, relevance)
+                else:
+                    heapq.heappushpop(top_scores, relevance)
+                if len(top_scores) == max_results:
+                    min_score = top_scores[0]
     
-    # Search all markdown files in notes directory
-    for year_dir in sorted(NOTES_DIR.glob('*/'), reverse=True):
-        if year_dir.is_dir() and not year_dir.name.startswith('.'):
-            for md_file in sorted(year_dir.glob('*.md'), reverse=True):
-                entries = extract_entries(md_file)
-                for entry in entries:
-                    relevance = calculate_relevance(entry, query_lower, query_terms)
-                    if relevance > 0:
-                        results.append({
-                            'heading': entry['heading'],
-                            'content': entry['content'][:300] + '...' if len(entry['content']) > 300 else entry['content'],
-                            'file': entry['file'],
-                            'date': entry['date'],
-                            'relevance': relevance
-                        })
-    
-    # Sort by relevance and limit results
-    results.sort(key=lambda x: x['relevance'], reverse=True)
-    return results[:max_results]
-
-def calculate_relevance(entry: Dict, query: str, query_terms: List[str]) -> int:
-    """Calculate relevance score for search results"""
+    # Top results by relevance (ties: newest file first, then file order).
+    # Result dicts are only built for the entries returned.
+    top = heapq.nlargest(max_results, matches, key=itemgetter(0, 1))
+    return [{
+        'heading': entry['heading'],
+        'content': entry['snippet'],
+        'file': entry['file'],
+        'date': entry['date'],
+        'relevance': relevance
+    } for relevance, _, entry in top]
+
+def _iter_search_entries() -> Iterator[Dict]:
+    """Yield every searchable index record
+
+    If the index no longer matches the files on disk (e.g. after manual
+    edits) it is brought up to date first; only changed files are re-parsed.
+    """
+    index = _load_index()
+    if not _index_is_current(index):
+        index = _build_index(index)
+        # Best effort: search still uses the in-memory index if this fails
+        _write_index(index)
+
+    yield from index['entries']
+
+def calculate_relevance(entry: Dict, query: str, query_terms: List[str], today: Optional[int] = None,
+                        min_score: int = 0) -> int:
+    """Calculate relevance score for search results
+
+    Expects an index record, whose heading_lower/content_lower fields are
+    lowercased once at index time rather than on every query. `today` is
+    the current date as an ordinal, computed once per search by the caller.
+    Returns 0 without scanning the content if the entry cannot score at
+    least `min_score` (e.g. the lowest score already in the top results).
+    """
     heading_score = 0
     content_score = 0
-    heading_lower = entry['heading'].lower()
-    content_lower = entry['content'].lower()
+    heading_lower = entry['heading_lower']
+    content_lower = entry['content_lower']
 
     # Exact phrase match in heading (highest priority - overwhelming bonus)
     if query in heading_lower:
@@ -160,31 +289,39 @@ def calculate_relevance(entry: Dict, query: str, query_terms: List[str]) -> int:
             if term in heading_lower:
                 heading_score += 20
 
-    # Terms in content (capped to prevent overwhelming heading matches)
+    # Content adds at most 50 points and recency at most 10
+    if heading_score + 60 < min_score:
+        return 0
+
+    # Terms in content (capped to prevent overwhelming heading matches).
+    # Each term is counted separately, so overlapping terms ('test',
+    # 'testing') both score; stop scanning once the cap is reached.
     for term in query_terms:
         content_score += content_lower.count(term) * 5
-    # Cap content contribution at 50 points
-    content_score = min(content_score, 50)
+        if content_score >= 50:
+            # Cap content contribution at 50 points
+            content_score = 50
+            break
 
     # Calculate base score (must have content or heading match)
     base_score = heading_score + content_score
 
     # Only apply recency bonus if there's an actual match
-    if base_score > 0:
-        try:
-            date = datetime.fromisoformat(entry['date'])
-            days_old = (datetime.now() - date).days
-            if days_old < 30:
-                base_score += 10
-            elif days_old < 90:
-                base_score += 5
-            elif days_old < 180:
-                base_score += 2
-        except Exception:
-            pass  # Date parsing failed, skip recency bonus
+    # (skipped when the entry's date could not be parsed)
+    if base_score > 0 and entry['date_ordinal'] is not None:
+        if today is None:
+            today = datetime.now().toordinal()
+        days_old = today - entry['date_ordinal']
+        if days_old < 30:
+            base_score += 10
+        elif days_old < 90:
+            base_score += 5
+        elif days_old < 180:
+            base_score += 2
 
     return base_score
 
+@_exclusive
 def append_to_entry(search_term: str, new_content: str) -> Dict:
     """Find an entry and append content to it"""
     results = search_notes(search_term, max_results=5)
@@ -211,6 +348,7 @@ def append_to_entry(search_term: str, new_content: str) -> Dict:
     
     # Read the file
     try:
+        previous_stamp = _file_stamp(file_path.stat())
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
     except Exception as e:
@@ -220,36 +358,29 @@ def append_to_entry(search_term: str, new_content: str) -> Dict:
     timestamp = datetime.now().strftime("%Y-%m-%d")
     update_text = f"\n**Update ({timestamp}):** {new_content.strip()}\n"
     
-    # Find the entry and append
-    lines = content.split('\n')
-    new_lines = []
-    in_target = False
-    inserted = False
-    
-    for line in lines:
-        new_lines.append(line)
-        
-        if line.strip() == f"# {target['heading']}":
-            in_target = True
-        elif in_target and line.startswith('# ') and not line.startswith('## '):
-            # Found next entry, insert before it
-            new_lines.insert(-1, update_text)
-            inserted = True
-            in_target = False
-    
-    if in_target and not inserted:
+    # Find the entry's heading line, then the next top-level heading (or EOF)
+    heading_re = re.compile(rf"^# [# ]*{re.escape(target['heading'])}[# ]*$", re.MULTILINE)
+    heading_match = heading_re.search(content)
+    if not heading_match:
+        return {'status': 'error', 'message': 'Failed to locate entry in file'}
+
+    next_heading = NEXT_HEADING_RE.search(content, heading_match.end())
+    if next_heading:
+        # Insert before the next entry
+        pos = next_heading.start()
+        new_content = content[:pos] + update_text + '\n' + content[pos:]
+    else:
         # Was the last entry, append at end
-        new_lines.append(update_text)
-    
+        new_content = content + '\n' + update_text
+
     # Write back
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(new_lines))
+        _write_text_atomic(file_path, new_content)
     except Exception as e:
         return {'status': 'error', 'message': f"Failed to write file: {e}"}
     
-    # Update index
-    update_index()
+    # Update index for just this file
+    _refresh_index_file(file_path, previous_stamp)
     
     return {
         'status': 'success',
@@ -258,6 +389,7 @@ def append_to_entry(search_term: str, new_content: str) -> Dict:
         'alternatives': [r['heading'] for r in results[1:3]] if len(results) > 1 else []
     }
 
+@_exclusive
 def replace_entry(search_term: str, new_content: str, preserve_timestamp: bool = True, target_file: str = None) -> Dict:
     """
     Replace an entry's content entirely (for async enrichment).
@@ -315,6 +447,7 @@ def replace_entry(search_term: str, new_content: str, preserve_timestamp: bool =
 
     # Read the file
     try:
+        previous_stamp = _file_stamp(file_path.stat())
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
     except Exception as e:
@@ -333,38 +466,26 @@ def replace_entry(search_term: str, new_content: str, preserve_timestamp: bool =
     # Build replacement entry (heading + new content + timestamp)
     replacement_entry = f"# {target['heading']}\n{new_content.strip()}\n\n**Created:** {timestamp}\n"
 
-    # Find and replace the entry
-    lines = content.split('\n')
-    new_lines = []
-    in_target = False
-    replaced = False
-
-    for i, line in enumerate(lines):
-        if line.strip() == f"# {target['heading']}":
-            # Found target entry, replace it
-            in_target = True
-            new_lines.append(replacement_entry)
-            replaced = True
-        elif in_target and line.startswith('# ') and not line.startswith('## '):
-            # Found next entry, exit target zone
-            in_target = False
-            new_lines.append(line)
-        elif not in_target:
-            new_lines.append(line)
-        # Skip lines while in_target (they're being replaced)
+    # Find and replace the entry: its heading line through the line before
+    # the next top-level heading (or EOF), in one pass over the text
+    heading_line = rf"^[^\S\n]*# {re.escape(target['heading'])}[^\S\n]*$"
+    entry_re = re.compile(rf"{heading_line}.*?(?=^# |{heading_line}|\Z)", re.DOTALL | re.MULTILINE)
+    new_content, replaced = entry_re.subn(
+        lambda m: replacement_entry if m.end() == len(content) else replacement_entry + '\n',
+        content
+    )
 
     if not replaced:
         return {'status': 'error', 'message': 'Failed to locate entry in file'}
 
     # Write back
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(new_lines))
+        _write_text_atomic(file_path, new_content)
     except Exception as e:
         return {'status': 'error', 'message': f"Failed to write file: {e}"}
 
-    # Update index
-    update_index()
+    # Update index for just this file
+    _refresh_index_file(file_path, previous_stamp)
 
     return {
         'status': 'success',
@@ -373,65 +494,222 @@ def replace_entry(search_term: str, new_content: str, preserve_timestamp: bool =
         'replaced': True
     }
 
+def _build_index_entry(entry: Dict) -> Dict:
+    """Build the index record for a parsed entry"""
+    # Extract unique lowercase keywords in order of appearance, excluding
+    # common ones. Heading and content are scanned in turn (no concatenated
+    # copy), stopping as soon as MAX_KEYWORDS are found.
+    keywords = {}
+    matches = chain(KEYWORD_RE.finditer(entry['heading']), KEYWORD_RE.finditer(entry['content']))
+    for match in matches:
+        word = match.group().lower()
+        if word not in COMMON_WORDS:
+            keywords[word] = None
+            if len(keywords) == MAX_KEYWORDS:
+                break
+
+    # Extract category if present
+    category = None
+    if ' - ' in entry['heading']:
+        category = entry['heading'].split(' - ')[0].strip()
+
+    content = entry['content']
+    return {
+        'heading': entry['heading'],
+        'file': entry['file'],
+        'date': entry['date'],
+        'date_ordinal': _date_ordinal(entry['date']),
+        'category': category,
+        'keywords': list(keywords),
+        'content_preview': content[:100].strip(),
+        # Search fields: lowercased text for scoring, display text for results
+        'heading_lower': entry['heading'].lower(),
+        'content_lower': content.lower(),
+        'snippet': content[:300] + '...' if len(content) > 300 else content
+    }
+
+def _date_ordinal(date: str) -> Optional[int]:
+    """Convert an entry date (YYYY-MM-DD) to a day ordinal, or None if invalid"""
+    try:
+        return datetime.fromisoformat(date).toordinal()
+    except ValueError:
+        return None
+
+def _read_index_file() -> Dict:
+    """Read and parse the index file (raises if it is missing or invalid)"""
+    data = INDEX_FILE.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def _load_index() -> Dict:
+    """Load the current index, or an empty dict if it is missing or unreadable"""
+    try:
+        return _read_index_file()
+    except (OSError, ValueError):
+        return {}
+
+def _index_is_current(index: Dict) -> bool:
+    """Check that the index covers exactly the month files on disk, unmodified"""
+    files = index.get('files')
+    if index.get('version') != INDEX_VERSION or files is None:
+        return False
+
+    seen = 0
+    for md_file in _iter_markdown_files():
+        cached = files.get(str(Path(md_file.path).relative_to(NOTES_DIR)))
+        if cached != _file_stamp(md_file.stat()):
+            return False
+        seen += 1
+    return seen == len(files)
+
+def _file_stamp(stat: os.stat_result) -> Dict[str, int]:
+    """Change stamp recorded per file in the index
+
+    Nanosecond mtime plus size: an edit within the same float-mtime tick,
+    or one that restores the old mtime, still changes the size.
+    """
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
 def update_index() -> Dict:
-    """Rebuild the search index from all markdown files"""
+    """Rebuild the search index from all markdown files
+
+    If the index already matches every file on disk it is left untouched
+    (clean_index() forces a full rebuild).
+    """
+    index = _load_index()
+    if _index_is_current(index):
+        return dict(_index_report(index), up_to_date=True)
+    return _write_index(_build_index(index))
+
+def _build_index(previous: Dict) -> Dict:
+    """Build the index for all markdown files
+
+    Files whose stamp (mtime and size) matches the previous index reuse
+    their cached records; only new or modified files are re-parsed.
+    """
     index = {
+        'version': INDEX_VERSION,
         'entries': [],
+        'files': {},
         'last_updated': datetime.now().isoformat(),
         'total_files': 0,
         'total_entries': 0
     }
-    
+
+    # Group cached records by file (ignored if the schema has changed)
+    if previous.get('version') != INDEX_VERSION:
+        previous = {}
+    cached_files = previous.get('files', {})
+    cached_entries = {}
+    for record in previous.get('entries', []):
+        cached_entries.setdefault(record['file'], []).append(record)
+
     # Scan all markdown files
     file_count = 0
     entry_count = 0
-    
-    for year_dir in sorted(NOTES_DIR.glob('*/'), reverse=True):
-        if year_dir.is_dir() and not year_dir.name.startswith('.'):
-            for md_file in sorted(year_dir.glob('*.md')):
-                file_count += 1
-                entries = extract_entries(md_file)
-                entry_count += len(entries)
-                
-                for entry in entries:
-                    # Extract keywords
-                    text = entry['heading'] + ' ' + entry['content']
-                    words = re.findall(r'\b[a-zA-Z]{3,}\b', text)
-                    # Get unique words, excluding common ones
-                    common_words = {'the', 'and', 'for', 'that', 'with', 'this', 'from', 'have', 'was', 'were'}
-                    keywords = [w for w in set(words) if w.lower() not in common_words][:15]
-                    
-                    # Extract category if present
-                    category = None
-                    if ' - ' in entry['heading']:
-                        category = entry['heading'].split(' - ')[0].strip()
-                    
-                    index['entries'].append({
-                        'heading': entry['heading'],
-                        'file': entry['file'],
-                        'date': entry['date'],
-                        'category': category,
-                        'keywords': keywords[:10],
-                        'content_preview': entry['content'][:100].strip()
-                    })
-    
+
+    # Keep records grouped by file, oldest first (see _refresh_index_file)
+    for md_file in sorted(_iter_markdown_files(), key=lambda e: e.path):
+        file_count += 1
+        rel_path = str(Path(md_file.path).relative_to(NOTES_DIR))
+        stamp = _file_stamp(md_file.stat())
+        index['files'][rel_path] = stamp
+
+        if cached_files.get(rel_path) == stamp:
+            records = cached_entries.get(rel_path, [])
+        else:
+            records = [_build_index_entry(entry) for entry in extract_entries(md_file.path)]
+
+        entry_count += len(records)
+        index['entries'].extend(records)
+
     index['total_files'] = file_count
     index['total_entries'] = entry_count
-    
-    # Write index
+    return index
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """Rewrite a note file via a temporary file renamed into place
+
+    A crash mid-write leaves either the old or the new file, never a
+    truncated one. The temporary name doesn't end in .md, so scans skip it.
+    Symlinks are followed (the link stays a link) and the file's permission
+    bits are kept.
+    """
+    target = Path(os.path.realpath(path))
+    tmp_file = target.with_name(target.name + '.tmp')
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            shutil.copymode(target, tmp_file)
+            f.write(text)
+        os.replace(tmp_file, target)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+def _write_index(index: Dict) -> Dict:
+    """Write the index to disk and report its totals
+
+    The index is machine-read, so it is serialized compactly. It is written
+    to a temporary file and renamed into place, so a crash mid-write never
+    leaves a truncated index behind.
+    """
+    tmp_file = INDEX_FILE.with_suffix('.json.tmp')
     try:
-        with open(INDEX_FILE, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(index)
+        else:
+            data = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, INDEX_FILE)
     except Exception as e:
         return {'status': 'error', 'message': f"Failed to write index: {e}"}
-    
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+    return _index_report(index)
+
+def _index_report(index: Dict) -> Dict:
+    """Summary of an index returned by the reindex commands"""
     return {
         'status': 'success',
-        'total_files': file_count,
-        'total_entries': entry_count,
+        'total_files': index['total_files'],
+        'total_entries': index['total_entries'],
         'index_path': str(INDEX_FILE)
     }
 
+def _refresh_index_file(file_path: Path, previous_stamp: Optional[Dict[str, int]]) -> Dict:
+    """Update the index after writing to a single month file
+
+    Re-parses only that file and replaces its records in place.
+    `previous_stamp` is the file's stamp before the write (None if it did
+    not exist). Falls back to update_index() when the index is missing or
+    was already out of date for this file.
+    """
+    index = _load_index()
+    rel_path = str(file_path.relative_to(NOTES_DIR))
+    cached = index.get('files', {}).get(rel_path)
+    if index.get('version') != INDEX_VERSION or cached != previous_stamp:
+        return update_index()
+
+    entries = index['entries']
+    positions = [i for i, record in enumerate(entries) if record['file'] == rel_path]
+    # Stamp before parsing: a write landing in between then leaves the
+    # index looking stale for this file rather than current
+    stamp = _file_stamp(file_path.stat())
+    records = [_build_index_entry(entry) for entry in extract_entries(file_path)]
+
+    # Records are grouped by file in path order (as _build_index writes
+    # them); a new file's records go before those of the next file
+    if positions:
+        start, end = positions[0], positions[-1] + 1
+    else:
+        start = end = next((i for i, record in enumerate(entries) if record['file'] > rel_path), len(entries))
+    entries[start:end] = records
+
+    index['files'][rel_path] = stamp
+    index['last_updated'] = datetime.now().isoformat()
+    index['total_files'] = len(index['files'])
+    index['total_entries'] = len(entries)
+    return _write_index(index)
+
 def get_info() -> Dict:
     """Get information about notes directory and configuration"""
     onedrive_path = Path.home() / 'OneDrive' / 'Documents'
@@ -454,32 +732,23 @@ def get_info() -> Dict:
 def get_stats() -> Dict:
     """Get statistics about the notes system"""
     try:
-        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
-            index = json.load(f)
-        
+        index = _read_index_file()
+        entries = index.get('entries', [])
+
         # Calculate category distribution
-        categories = {}
-        for entry in index.get('entries', []):
-            cat = entry.get('category', 'Uncategorized')
-            categories[cat] = categories.get(cat, 0) + 1
-        
+        categories = Counter(entry.get('category', 'Uncategorized') for entry in entries)
+
         # Find most common keywords
-        all_keywords = []
-        for entry in index.get('entries', []):
-            all_keywords.extend(entry.get('keywords', []))
-        
-        keyword_counts = {}
-        for kw in all_keywords:
-            keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
-        
-        top_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        keyword_counts = Counter(chain.from_iterable(entry.get('keywords', ()) for entry in entries))
+
+        top_keywords = keyword_counts.most_common(10)
         
         return {
             'status': 'success',
             'total_entries': index.get('total_entries', 0),
             'total_files': index.get('total_files', 0),
             'last_updated': index.get('last_updated'),
-            'categories': categories,
+            'categories': dict(categories),
             'top_keywords': top_keywords
         }
     except FileNotFoundError:
@@ -512,24 +781,51 @@ def clean_index() -> Dict:
             'message': f'Failed to clean index: {str(e)}'
         }
 
+def _scan_note_file(path: str) -> Tuple[str, bool]:
+    """Return a note file's first character and whether it has non-whitespace text
+
+    The file is decoded as UTF-8 in fixed-size chunks, so memory use does not
+    grow with the file size; invalid bytes raise UnicodeDecodeError.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    first_char = ''
+    has_text = False
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(1 << 16)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                first_char = first_char or text[0]
+                has_text = has_text or not text.isspace()
+            if not chunk:
+                return first_char, has_text
+
 def validate() -> Dict:
     """Check all note files for issues"""
     issues = []
     files_checked = 0
 
     try:
-        for year_dir in sorted(NOTES_DIR.glob('[0-9]*')):
-            if not year_dir.is_dir():
-                continue
-
-            for note_file in sorted(year_dir.glob('*.md')):
+        try:
+            with os.scandir(NOTES_DIR) as it:
+                year_dirs = sorted((e for e in it if '0' <= e.name[:1] <= '9' and e.is_dir()),
+                                   key=lambda e: e.name)
+        except FileNotFoundError:
+            year_dirs = []
+
+        for year_dir in year_dirs:
+            with os.scandir(year_dir.path) as it:
+                note_files = sorted((e for e in it if e.name.endswith('.md')),
+                                    key=lambda e: e.name)
+
+            for note_file in note_files:
                 files_checked += 1
 
                 try:
-                    content = note_file.read_text(encoding='utf-8')
+                    first_char, has_text = _scan_note_file(note_file.path)
 
                     # Check for empty files
-                    if not content.strip():
+                    if not has_text:
                         issues.append({
                             'file': f"{year_dir.name}/{note_file.name}",
                             'issue': 'Empty file',
@@ -537,7 +833,7 @@ def validate() -> Dict:
                         })
 
                     # Check for proper heading format
-                    elif not content.startswith('#'):
+                    elif first_char != '#':
                         issues.append({
                             'file': f"{year_dir.name}/{note_file.name}",
                             'issue': 'No top-level heading',
@@ -591,6 +887,10 @@ def migrate(source_dir: str) -> Dict:
         skipped = []
         errors = []
 
+        # Source contents grouped by destination month file, so each
+        # destination is opened and written once
+        pending = {}
+
         for md_file in source.glob('**/*.md'):
             try:
                 # Skip hidden files and index
@@ -607,25 +907,12 @@ def migrate(source_dir: str) -> Dict:
 
                 # Use file modification time to determine target year/month
                 mtime = datetime.fromtimestamp(md_file.stat().st_mtime)
-                year_dir = NOTES_DIR / str(mtime.year)
-                year_dir.mkdir(parents=True, exist_ok=True)
-
                 month_name = mtime.strftime('%B')
-                month_file = year_dir / f"{mtime.month:02d}-{month_name}.md"
+                destination = f"{mtime.year}/{mtime.month:02d}-{month_name}.md"
 
-                # Append with separator if file exists
-                mode = 'a' if month_file.exists() else 'w'
-                with open(month_file, mode, encoding='utf-8') as f:
-                    if mode == 'a':
-                        f.write('\n\n')
-                    f.write(content)
-                    if not content.endswith('\n'):
-                        f.write('\n')
-
-                imported.append({
-                    'source': md_file.name,
-                    'destination': f"{mtime.year}/{month_file.name}"
-                })
+                if not content.endswith('\n'):
+                    content += '\n'
+                pending.setdefault(destination, []).append((md_file.name, content))
 
             except Exception as e:
                 errors.append({
@@ -633,6 +920,23 @@ def migrate(source_dir: str) -> Dict:
                     'error': str(e)
                 })
 
+        for destination, sources in pending.items():
+            month_file = NOTES_DIR / destination
+            try:
+                month_file.parent.mkdir(parents=True, exist_ok=True)
+
+                # Append with separator if file exists
+                body = '\n\n'.join(content for _, content in sources)
+                if month_file.exists():
+                    body = '\n\n' + body
+                with open(month_file, 'a', encoding='utf-8') as f:
+                    f.write(body)
+
+                imported.extend({'source': name, 'destination': destination} for name, _ in sources)
+
+            except Exception as e:
+                errors.extend({'file': name, 'error': str(e)} for name, _ in sources)
+
         # Rebuild index after migration
         reindex_result = update_index()
 
@@ -655,19 +959,12 @@ def migrate(source_dir: str) -> Dict:
             'message': f'Migration failed: {str(e)}'
         }
 
-def main():
-    """Main entry point"""
-    # Read command from stdin or command line
-    if not sys.stdin.isatty():
-        try:
-            data = json.load(sys.stdin)
-        except json.JSONDecodeError:
-            data = {'command': 'help'}
-    elif len(sys.argv) > 1:
-        data = {'command': sys.argv[1]}
-    else:
-        data = {'command': 'help'}
+def handle_command(data: Dict) -> Union[Dict, List[Dict]]:
+    """Execute one command dict (as read from stdin) and return its result
 
+    Lets other scripts (e.g. quick_note.py) call the notes manager
+    in-process instead of spawning it.
+    """
     command = data.get('command', 'help')
 
     # Execute command
@@ -724,8 +1021,24 @@ def main():
             'usage': 'echo \'{"command":"search","query":"test"}\' | python notes_manager.py'
         }
 
+    return result
+
+def main():
+    """Main entry point"""
+    # Read command from stdin or command line
+    if not sys.stdin.isatty():
+        try:
+            raw = sys.stdin.buffer.read()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        except json.JSONDecodeError:
+            data = {'command': 'help'}
+    elif len(sys.argv) > 1:
+        data = {'command': sys.argv[1]}
+    else:
+        data = {'command': 'help'}
+
     # Output result as JSON
-    print(json.dumps(result, indent=2))
+    print(json.dumps(handle_command(data), indent=2))
     return 0
 
 if __name__ == '__main__':
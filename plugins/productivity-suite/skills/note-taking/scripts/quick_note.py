@@ -10,17 +10,39 @@ Usage: python quick_note.py "your note content"
        python quick_note.py --no-enrich "quick note without enrichment"
 """
 
+import hashlib
 import json
 import os
+import re
+import sqlite3
 import sys
 import subprocess
-import threading
-import atexit
+import time
 from pathlib import Path
 
-# Capture script directory at module load time (required for threading)
+# Capture script directory at module load time
 SCRIPT_DIR = Path(__file__).parent
 NOTES_MANAGER = SCRIPT_DIR / "notes_manager.py"
+# Subprocess fallback: same interpreter, no site.py (notes_manager is stdlib-only;
+# orjson is optional) and isolated mode, which cuts interpreter startup
+NOTES_MANAGER_CMD = [sys.executable, "-S", "-I", str(NOTES_MANAGER)]
+
+# Call notes_manager in-process (saves a Python startup per save);
+# falls back to running it as a subprocess if the import fails
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+try:
+    import notes_manager
+    NOTES_MANAGER_AVAILABLE = True
+except ImportError:
+    NOTES_MANAGER_AVAILABLE = False
+
+# Optional: faster JSON for the subprocess fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 try:
     from anthropic import Anthropic
@@ -31,22 +53,45 @@ except ImportError:
 
 # Configuration - Category Inference (Phase 1)
 MODEL = "claude-haiku-4-5-20251001"
-MAX_TOKENS = 30
+MAX_TOKENS = 5  # category names are 1-3 tokens
 TIMEOUT = 2.0  # seconds
 MAX_RETRIES = 1
 MAX_INPUT_LENGTH = 1000
 
+# Configuration - Category cache (repeated notes skip the API)
+CATEGORY_CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "quick_note" / "categories.sqlite"
+CATEGORY_CACHE_MAX_ENTRIES = 10000
+
 # Configuration - Enrichment (Phase 2)
 ENRICHMENT_MAX_TOKENS = 600
 ENRICHMENT_TIMEOUT = 15.0  # Longer timeout for background processing
 ENRICHMENT_TEMPERATURE = 0.3  # Slight creativity for enrichment
+ENRICH_ONLY_FLAG = "--enrich-only"  # Internal: run enrichment for a saved note
 
-# Thread tracking for graceful shutdown
-_enrichment_thread = None
+# Per-process API client, created lazily by get_client()
+_client = None
 
 VALID_CATEGORIES = ["Work", "Learning", "Meeting", "Idea", "Decision", "Question", "Reference", "Note"]
+_VALID_CATEGORY_SET = frozenset(VALID_CATEGORIES)
+_VALID_CATEGORIES_LOWER = {category.lower(): category for category in VALID_CATEGORIES}
 DEFAULT_CATEGORY = "Note"
 
+# Unambiguous cue phrases (whole words, case-insensitive) that settle the
+# category locally, skipping the API call. Only used when the cues of
+# exactly one category appear; every other note goes to the model.
+CATEGORY_CUES = {
+    "Meeting": ["meeting", "standup", "stand-up", "1:1", "one-on-one"],
+    "Learning": ["learned", "realized"],
+    "Idea": ["what if", "brainstorm"],
+    "Decision": ["decided"],
+    "Question": ["how to", "how do i", "how does"],
+    "Reference": ["bookmark"],
+}
+_CATEGORY_CUE_PATTERNS = {
+    category: re.compile(r"\b(?:" + "|".join(map(re.escape, cues)) + r")\b", re.IGNORECASE)
+    for category, cues in CATEGORY_CUES.items()
+}
+
 SYSTEM_PROMPT = """You are a note categorizer. Given a note, return ONLY the category name.
 
 Categories: Work, Learning, Meeting, Idea, Decision, Question, Reference, Note
@@ -97,7 +142,118 @@ Recent study link: https://example.com exploring "Compression is Intelligence" t
 **Next Steps:** Consider how this applies to current projects - are there opportunities to better compress complexity?"""
 
 
+def get_client():
+    """
+    Get this process's Anthropic client, creating it on first use.
+
+    Category inference and enrichment run in separate processes (see
+    enrich_note_async), so each builds its own client and no connection
+    is shared between them. Timeouts are passed per request.
+    """
+    global _client
+    if _client is None:
+        _client = Anthropic(max_retries=MAX_RETRIES)
+    return _client
+
+
+def match_category_cues(note_text: str) -> str:
+    """
+    Infer category locally from unambiguous cue phrases.
+
+    Returns:
+        str: The category, or None if no cues (or cues of several categories) matched
+    """
+    matches = [category for category, pattern in _CATEGORY_CUE_PATTERNS.items()
+               if pattern.search(note_text)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _category_cache_key(note_text: str) -> str:
+    """Hash of the note text, normalized for case and whitespace."""
+    normalized = " ".join(note_text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _open_category_cache() -> sqlite3.Connection:
+    """Open the category cache database, creating it if needed."""
+    CATEGORY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CATEGORY_CACHE_FILE, timeout=1.0)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS categories "
+        "(hash TEXT PRIMARY KEY, category TEXT NOT NULL, ts INTEGER NOT NULL)"
+    )
+    return conn
+
+
+def get_cached_category(note_text: str) -> str:
+    """
+    Look up the category previously inferred for the same note text.
+
+    Returns:
+        str: The cached category, or None on a miss (or if the cache is unusable)
+    """
+    key = _category_cache_key(note_text)
+    try:
+        conn = _open_category_cache()
+        try:
+            with conn:
+                row = conn.execute("SELECT category FROM categories WHERE hash = ?", (key,)).fetchone()
+                if row:
+                    # Refresh for least-recently-used eviction
+                    conn.execute("UPDATE categories SET ts = ? WHERE hash = ?", (int(time.time()), key))
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        return None
+
+    if row and row[0] in _VALID_CATEGORY_SET:
+        return row[0]
+    return None
+
+
+def cache_category(note_text: str, category: str):
+    """Store an inferred category, evicting the least recently used beyond the cap."""
+    try:
+        conn = _open_category_cache()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO categories (hash, category, ts) VALUES (?, ?, ?)",
+                    (_category_cache_key(note_text), category, int(time.time()))
+                )
+                conn.execute(
+                    "DELETE FROM categories WHERE hash NOT IN "
+                    "(SELECT hash FROM categories ORDER BY ts DESC, rowid DESC LIMIT ?)",
+                    (CATEGORY_CACHE_MAX_ENTRIES,)
+                )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        pass  # Cache is best effort
+
+
 def infer_category(note_text: str) -> tuple:
+    """
+    Infer category from note text.
+
+    Tries, in order: unambiguous cue phrases (see CATEGORY_CUES), the
+    category cache for previously seen note text, then Claude Haiku 4.5.
+    Successful API results are cached.
+
+    Returns:
+        tuple: (category: str, api_success: bool)
+    """
+    category = match_category_cues(note_text) or get_cached_category(note_text)
+    if category:
+        return category, True
+
+    category, api_success = call_category_api(note_text)
+    if api_success:
+        cache_category(note_text, category)
+    return category, api_success
+
+
+def call_category_api(note_text: str) -> tuple:
     """
     Infer category from note text using Claude Haiku 4.5.
 
@@ -111,23 +267,26 @@ def infer_category(note_text: str) -> tuple:
         return DEFAULT_CATEGORY, False
 
     try:
-        client = Anthropic(timeout=TIMEOUT, max_retries=MAX_RETRIES)
-        response = client.messages.create(
+        response = get_client().messages.create(
             model=MODEL,
             max_tokens=MAX_TOKENS,
             temperature=0.0,
+            stop_sequences=["\n"],
             system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": note_text[:MAX_INPUT_LENGTH]}]
+            messages=[{"role": "user", "content": note_text[:MAX_INPUT_LENGTH]}],
+            timeout=TIMEOUT
         )
-        category = response.content[0].text.strip()
+        # Empty if the model opened with a newline (stop sequence)
+        category = response.content[0].text.strip() if response.content else ""
 
         # Validate category
-        if category in VALID_CATEGORIES:
+        if category in _VALID_CATEGORY_SET:
             return category, True
 
         # Try to extract category if response contains extra text
-        for valid_cat in VALID_CATEGORIES:
-            if valid_cat.lower() in category.lower():
+        category_lower = category.lower()
+        for valid_lower, valid_cat in _VALID_CATEGORIES_LOWER.items():
+            if valid_lower in category_lower:
                 return valid_cat, True
 
         return DEFAULT_CATEGORY, True  # API worked but invalid category
@@ -147,6 +306,32 @@ def infer_category(note_text: str) -> tuple:
         return DEFAULT_CATEGORY, False
 
 
+def run_notes_manager(command: dict) -> dict:
+    """
+    Run a notes_manager command in-process.
+
+    Args:
+        command: Command dict, as notes_manager.py reads from stdin
+
+    Returns:
+        dict: Result from notes_manager
+    """
+    try:
+        return notes_manager.handle_command(command)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def encode_command(command: dict) -> bytes:
+    """Serialize a notes_manager command as UTF-8 JSON for its stdin."""
+    return orjson.dumps(command) if ORJSON_AVAILABLE else json.dumps(command).encode("utf-8")
+
+
+def decode_result(output: bytes) -> dict:
+    """Parse notes_manager's JSON stdout (raises json.JSONDecodeError)."""
+    return orjson.loads(output) if ORJSON_AVAILABLE else json.loads(output)
+
+
 def add_note(category: str, content: str) -> dict:
     """
     Add note using notes_manager.py.
@@ -168,32 +353,34 @@ def add_note(category: str, content: str) -> dict:
         description += "..."
     heading = f"{category} - {description}"
 
-    cmd_input = json.dumps({
+    command = {
         "command": "add",
         "heading": heading,
         "content": content
-    })
+    }
+    if NOTES_MANAGER_AVAILABLE:
+        return run_notes_manager(command)
 
     try:
         result = subprocess.run(
-            ["python", str(NOTES_MANAGER)],
-            input=cmd_input,
+            NOTES_MANAGER_CMD,
+            input=encode_command(command),
             capture_output=True,
-            text=True,
             timeout=5
         )
 
         if result.returncode == 0:
             try:
-                return json.loads(result.stdout)
+                return decode_result(result.stdout)
             except json.JSONDecodeError:
-                return {"status": "error", "message": f"Invalid JSON from notes_manager: {result.stdout}"}
-        return {"status": "error", "message": result.stderr or "Unknown error from notes_manager"}
+                output = result.stdout.decode("utf-8", errors="replace")
+                return {"status": "error", "message": f"Invalid JSON from notes_manager: {output}"}
+        return {"status": "error", "message": result.stderr.decode("utf-8", errors="replace") or "Unknown error from notes_manager"}
 
     except subprocess.TimeoutExpired:
         return {"status": "error", "message": "notes_manager.py timed out"}
     except FileNotFoundError:
-        return {"status": "error", "message": "Python not found in PATH"}
+        return {"status": "error", "message": f"Python interpreter not found: {sys.executable}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -213,8 +400,7 @@ def call_enrichment_api(category: str, content: str) -> str:
         return None
 
     try:
-        client = Anthropic(timeout=ENRICHMENT_TIMEOUT, max_retries=1)
-        response = client.messages.create(
+        response = get_client().messages.create(
             model=MODEL,
             max_tokens=ENRICHMENT_MAX_TOKENS,
             temperature=ENRICHMENT_TEMPERATURE,
@@ -222,7 +408,8 @@ def call_enrichment_api(category: str, content: str) -> str:
             messages=[{
                 "role": "user",
                 "content": f"Category: {category}\nOriginal note: {content}\n\nEnrich this note for future reference."
-            }]
+            }],
+            timeout=ENRICHMENT_TIMEOUT
         )
         return response.content[0].text.strip()
 
@@ -244,35 +431,36 @@ def replace_note(heading: str, content: str, target_file: str = None) -> dict:
     Returns:
         dict: Result from notes_manager.py
     """
-    cmd_input = json.dumps({
+    command = {
         "command": "replace",
         "search_term": heading,
         "content": content,
         "preserve_timestamp": True,
         "target_file": target_file
-    })
+    }
+    if NOTES_MANAGER_AVAILABLE:
+        return run_notes_manager(command)
 
     try:
         result = subprocess.run(
-            ["python", str(NOTES_MANAGER)],
-            input=cmd_input,
+            NOTES_MANAGER_CMD,
+            input=encode_command(command),
             capture_output=True,
-            text=True,
             timeout=10
         )
 
         if result.returncode == 0:
-            return json.loads(result.stdout)
-        return {"status": "error", "message": result.stderr}
+            return decode_result(result.stdout)
+        return {"status": "error", "message": result.stderr.decode("utf-8", errors="replace")}
 
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
-def enrich_note_async(heading: str, category: str, original_content: str, target_file: str):
+def enrich_note(heading: str, category: str, original_content: str, target_file: str):
     """
-    Background thread for note enrichment.
-    Called after sync save completes - user already saw "Note saved".
+    Enrich a saved note and replace its content with the result.
+    Runs in the detached background process started by enrich_note_async.
 
     Args:
         heading: The exact heading of the saved note
@@ -280,42 +468,76 @@ def enrich_note_async(heading: str, category: str, original_content: str, target
         original_content: Original note content to enrich
         target_file: Exact file where note was saved (avoids race conditions)
     """
-    def _enrich():
-        try:
-            print("(Enriching in background...)", file=sys.stderr)
-            enriched = call_enrichment_api(category, original_content)
-            if enriched:
-                result = replace_note(heading, enriched, target_file)
-                if result.get("status") == "success":
-                    print(f"(Enriched: {heading[:40]}...)", file=sys.stderr)
-                else:
-                    print(f"Replace failed: {result.get('message')}", file=sys.stderr)
+    try:
+        enriched = call_enrichment_api(category, original_content)
+        if enriched:
+            result = replace_note(heading, enriched, target_file)
+            if result.get("status") == "success":
+                print(f"(Enriched: {heading[:40]}...)", file=sys.stderr)
             else:
-                print("(Enrichment API returned no content)", file=sys.stderr)
-        except Exception as e:
-            # Never crash - note is already saved with original content
-            print(f"Enrichment error: {e}", file=sys.stderr)
+                print(f"Replace failed: {result.get('message')}", file=sys.stderr)
+        else:
+            print("(Enrichment API returned no content)", file=sys.stderr)
+    except Exception as e:
+        # Never crash - note is already saved with original content
+        print(f"Enrichment error: {e}", file=sys.stderr)
 
-    global _enrichment_thread
-    _enrichment_thread = threading.Thread(target=_enrich, daemon=False)
-    _enrichment_thread.start()
 
+def enrich_note_async(heading: str, category: str, original_content: str, target_file: str):
+    """
+    Start note enrichment in a detached background process.
+    Called after sync save completes - user already saw "Note saved".
+    Returns immediately, so the shell prompt isn't held up by the
+    enrichment API call.
+
+    Args:
+        heading: The exact heading of the saved note
+        category: Note category for enrichment context
+        original_content: Original note content to enrich
+        target_file: Exact file where note was saved (avoids race conditions)
+    """
+    # The child would find no client to call - don't start it
+    if not ANTHROPIC_AVAILABLE or not os.environ.get("ANTHROPIC_API_KEY"):
+        return
 
-def _wait_for_enrichment():
-    """Brief wait for background enrichment on exit."""
-    global _enrichment_thread
-    if _enrichment_thread and _enrichment_thread.is_alive():
-        # Short grace period - user already saw "Note saved"
-        # Enrichment will complete even if we exit (non-daemon thread)
-        _enrichment_thread.join(timeout=2.0)
+    # Detach from the terminal/console so the process outlives this one
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
 
-# Register atexit handler to wait for enrichment before exit
-atexit.register(_wait_for_enrichment)
+    try:
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), ENRICH_ONLY_FLAG],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **detach
+        )
+        # The note is passed on stdin, not argv, where other local users
+        # could read it (ps, /proc/*/cmdline) while the child runs
+        job = {"heading": heading, "category": category, "target_file": target_file, "content": original_content}
+        process.stdin.write(json.dumps(job).encode("utf-8"))
+        process.stdin.close()
+        print("(Enriching in background...)", file=sys.stderr)
+    except Exception as e:
+        # Never crash - note is already saved with original content
+        print(f"Enrichment error: {e}", file=sys.stderr)
 
 
 def main():
     """Main entry point for quick note capture."""
 
+    # Background enrichment process started by enrich_note_async (job on stdin)
+    if sys.argv[1:] == [ENRICH_ONLY_FLAG] and not sys.stdin.isatty():
+        try:
+            job = json.load(sys.stdin)
+            enrich_note(job["heading"], job["category"], job["content"], job["target_file"])
+        except (ValueError, KeyError, TypeError):
+            print("Error: invalid enrichment job on stdin", file=sys.stderr)
+            sys.exit(1)
+        return
+
     # Check for --no-enrich flag
     skip_enrichment = "--no-enrich" in sys.argv
     args = [a for a in sys.argv[1:] if a != "--no-enrich"]
@@ -4,52 +4,61 @@ Create a properly formatted ZIP file for Claude Desktop skill upload.
 Ensures paths use forward slashes (/) not backslashes (\\).
 """
 
+import argparse
 import zipfile
 import os
 from pathlib import Path
 
-def create_skill_zip(skill_dir, output_zip):
+def _walk(base, arcbase):
+    """Yield (path, arcname) for every file under base, skipping .gz files.
+
+    Uses os.scandir so file types come from the directory listing, and
+    builds arcnames by joining names with '/' as it descends.
+    """
+    with os.scandir(base) as entries:
+        for entry in entries:
+            arcname = f"{arcbase}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path, arcname)
+            elif entry.is_file() and not entry.name.endswith('.gz'):
+                yield entry.path, arcname
+
+def create_skill_zip(skill_dir, output_zip, verbose=False):
     """Create a ZIP file with forward-slash paths for Claude Desktop."""
     skill_path = Path(skill_dir)
 
-    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    # Level 1 deflate: much faster than the default (6) and barely larger
+    # for small markdown/Python files
+    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
         # Add SKILL.md at root
         skill_md = skill_path / 'SKILL.md'
         if skill_md.exists():
             zipf.write(skill_md, 'SKILL.md')
-            print(f"Added: SKILL.md")
-
-        # Add all files in scripts/ directory
-        scripts_dir = skill_path / 'scripts'
-        if scripts_dir.exists():
-            for file in scripts_dir.rglob('*'):
-                if file.is_file() and not file.name.endswith('.gz'):
-                    arcname = f"scripts/{file.relative_to(scripts_dir).as_posix()}"
-                    zipf.write(file, arcname)
-                    print(f"Added: {arcname}")
-
-        # Add all files in templates/ directory
-        templates_dir = skill_path / 'templates'
-        if templates_dir.exists():
-            for file in templates_dir.rglob('*'):
-                if file.is_file() and not file.name.endswith('.gz'):
-                    arcname = f"templates/{file.relative_to(templates_dir).as_posix()}"
+
+        # Add all files in scripts/ and templates/ directories
+        for subdir in ('scripts', 'templates'):
+            source_dir = skill_path / subdir
+            if source_dir.exists():
+                for file, arcname in _walk(source_dir, subdir):
                     zipf.write(file, arcname)
-                    print(f"Added: {arcname}")
 
-    print(f"\nCreated {output_zip}")
+        contents = [info.filename for info in zipf.infolist()]
+
+    # List ZIP contents in a single write (opt-in)
+    if verbose:
+        print("ZIP contents:\n" + "\n".join(f"  {name}" for name in contents))
 
-    # Verify ZIP contents
-    print("\nZIP contents:")
-    with zipfile.ZipFile(output_zip, 'r') as zipf:
-        for info in zipf.infolist():
-            print(f"  {info.filename}")
+    print(f"Created {output_zip} ({len(contents)} files)")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-v', '--verbose', action='store_true', help='list every file added to the ZIP')
+    args = parser.parse_args()
+
     # Get the project root directory (parent of scripts/)
     project_root = Path(__file__).parent.parent
 
     skill_directory = project_root / 'plugins/productivity-suite/skills/note-taking'
     output_file = project_root / 'note-taking-skill.zip'
 
-    create_skill_zip(skill_directory, output_file)
+    create_skill_zip(skill_directory, output_file, verbose=args.verbose)
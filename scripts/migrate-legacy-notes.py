@@ -4,10 +4,12 @@ Legacy Notes Migration Script
 Migrates notes from YYYY-MM.md format to YYYY/MM-Month.md with category inference
 """
 
+import hashlib
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 # Month number to name mapping
 MONTHS = {
@@ -16,31 +18,43 @@ MONTHS = {
     '09': 'September', '10': 'October', '11': 'November', '12': 'December'
 }
 
-# Category inference keywords (lowercase)
+# Heading already in "Category - Description" format
+FORMATTED_HEADING_RE = re.compile(r'^# \w+ - ')
+
+# Legacy file stem (e.g., "2025-11")
+FILENAME_RE = re.compile(r'^(\d{4})-(\d{2})$')
+
+# Category inference keywords (lowercase, immutable)
 CATEGORY_KEYWORDS = {
-    'Work': ['develop', 'fix', 'build', 'deploy', 'setup', 'configure', 'move',
+    'Work': ('develop', 'fix', 'build', 'deploy', 'setup', 'configure', 'move',
              'install', 'update', 'upgrade', 'migrate', 'implement', 'create',
              'debug', 'troubleshoot', 'optimize', 'refactor', 'test', 'release',
-             'adapter', 'epublisher', 'aws', 'dns', 'server', 'machine'],
-    'Meeting': ['meeting', 'discussion', 'call', 'sync', 'standup', 'retrospective'],
-    'Health': ['scan', 'results', 'appointment', 'ct', 'doctor', 'medical', 'health',
-               'chest', 'contrast', 'mri', 'xray'],
-    'Learning': ['learn', 'tutorial', 'research', 'study', 'skills', 'course',
-                 'training', 'documentation', 'guide', 'claude', 'ai'],
-    'Idea': ['idea', 'concept', 'proposal', 'brainstorm', 'think', 'consider'],
-    'Decision': ['decided', 'chose', 'selected', 'cancel', 'cancelled', 'approved',
-                 'rejected', 'accepted'],
-    'Task': ['todo', 'task', 'action', 'need to', 'should', 'must'],
+             'adapter', 'epublisher', 'aws', 'dns', 'server', 'machine'),
+    'Meeting': ('meeting', 'discussion', 'call', 'sync', 'standup', 'retrospective'),
+    'Health': ('scan', 'results', 'appointment', 'ct', 'doctor', 'medical', 'health',
+               'chest', 'contrast', 'mri', 'xray'),
+    'Learning': ('learn', 'tutorial', 'research', 'study', 'skills', 'course',
+                 'training', 'documentation', 'guide', 'claude', 'ai'),
+    'Idea': ('idea', 'concept', 'proposal', 'brainstorm', 'think', 'consider'),
+    'Decision': ('decided', 'chose', 'selected', 'cancel', 'cancelled', 'approved',
+                 'rejected', 'accepted'),
+    'Task': ('todo', 'task', 'action', 'need to', 'should', 'must'),
 }
 
+# One compiled alternation per category, checked in CATEGORY_KEYWORDS order
+CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in CATEGORY_KEYWORDS.items()
+]
+
 
 def infer_category(heading: str) -> str:
     """Infer category from heading text using keyword matching"""
     heading_lower = heading.lower()
 
-    # Check each category's keywords
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        if any(keyword in heading_lower for keyword in keywords):
+    # Check each category's keywords (first matching category wins)
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(heading_lower):
             return category
 
     # Default category if no matches
@@ -50,7 +64,7 @@ def infer_category(heading: str) -> str:
 def process_heading(line: str) -> str:
     """Transform '# Heading' to '# Category - Heading' if not already formatted"""
     # Check if already in "Category - Description" format
-    if re.match(r'^# \w+ - ', line):
+    if FORMATTED_HEADING_RE.match(line):
         return line
 
     # Extract heading text (remove leading '# ')
@@ -63,26 +77,71 @@ def process_heading(line: str) -> str:
     return f"# {category} - {heading_text}\n"
 
 
-def process_file_content(content: str, year: str, month_name: str) -> str:
-    """Process file content: add header and transform headings"""
-    lines = content.split('\n')
-    output_lines = []
+def update_fence(line: str, fence: Optional[str]) -> Optional[str]:
+    """
+    Return the fenced code block marker in effect after line (None when
+    outside a fence): ``` or ~~~ opens a block, the same marker closes it
+    """
+    if fence is None:
+        return line[:3] if line.startswith(('```', '~~~')) else None
+    return None if line.startswith(fence) else fence
+
 
+def process_lines(lines: Iterable[str], year: str, month_name: str) -> Iterator[str]:
+    """Process file lines: yield the header, then lines with transformed headings"""
     # Add file header
-    output_lines.append(f"# Notes - {month_name} {year}\n")
-    output_lines.append("\n")
+    yield f"# Notes - {month_name} {year}\n"
+    yield "\n"
 
-    # Process each line
+    # Process each line (lines keep their own newline)
+    fence = None
     for line in lines:
-        # Check if line is a top-level heading (not ##)
-        if line.startswith('# ') and not line.startswith('## '):
+        # Check if line is a top-level heading (not ##, not a '# ' comment
+        # inside fenced code)
+        if fence is None and line.startswith('# ') and not line.startswith('## '):
             # Transform heading with category inference
-            output_lines.append(process_heading(line))
+            yield process_heading(line)
         else:
             # Keep line as-is
-            output_lines.append(line + '\n')
+            fence = update_fence(line, fence)
+            yield line
 
-    return ''.join(output_lines)
+
+def drop_duplicate_entries(lines: Iterable[str], duplicates: List[str]) -> Iterator[str]:
+    """
+    Yield lines, skipping entries (heading + body) identical to an earlier
+    entry in the same file; skipped headings are appended to duplicates
+    """
+    seen = set()
+    entry: List[str] = []
+    fence = None
+
+    def flush() -> Iterator[str]:
+        key = hashlib.blake2b(''.join(entry).strip().encode('utf-8'), digest_size=16).digest()
+        if key in seen:
+            duplicates.append(entry[0].strip())
+        else:
+            seen.add(key)
+            yield from entry
+
+    for line in lines:
+        # A top-level heading ends the previous entry ('# ' inside fenced
+        # code, e.g. a shell comment, is not a heading)
+        if fence is None and line.startswith('# '):
+            if entry:
+                yield from flush()
+            entry = [line]
+            continue
+
+        fence = update_fence(line, fence)
+        if entry:
+            entry.append(line)
+        else:
+            # Text before the first heading is passed through
+            yield line
+
+    if entry:
+        yield from flush()
 
 
 def migrate_file(source_path: Path, dest_base: Path) -> Tuple[bool, str]:
@@ -94,7 +153,10 @@ def migrate_file(source_path: Path, dest_base: Path) -> Tuple[bool, str]:
     filename = source_path.stem  # "2025-11"
 
     try:
-        year, month = filename.split('-')
+        match = FILENAME_RE.match(filename)
+        if not match:
+            return False, f"Invalid filename: {filename}.md (expected YYYY-MM.md)"
+        year, month = match.groups()
 
         if month not in MONTHS:
             return False, f"Invalid month number: {month}"
@@ -107,18 +169,23 @@ def migrate_file(source_path: Path, dest_base: Path) -> Tuple[bool, str]:
 
         dest_path = year_dir / f"{month}-{month_name}.md"
 
-        # Read source file
-        with open(source_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Process content
-        processed_content = process_file_content(content, year, month_name)
-
-        # Write to destination
-        with open(dest_path, 'w', encoding='utf-8') as f:
-            f.write(processed_content)
-
-        return True, f"Migrated {filename}.md -> {year}/{month}-{month_name}.md"
+        # Stream source lines to a temporary file, renamed into place once
+        # the whole file has been processed
+        tmp_path = dest_path.with_name(dest_path.name + '.tmp')
+        duplicates: List[str] = []
+        try:
+            with open(source_path, 'r', encoding='utf-8') as src, \
+                    open(tmp_path, 'w', encoding='utf-8') as dst:
+                dst.writelines(drop_duplicate_entries(process_lines(src, year, month_name), duplicates))
+            os.replace(tmp_path, dest_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        message = f"Migrated {filename}.md -> {year}/{month}-{month_name}.md"
+        if duplicates:
+            message += f" ({len(duplicates)} duplicate entries skipped)"
+            message += ''.join(f"\n    skipped duplicate: {heading}" for heading in duplicates)
+        return True, message
 
     except Exception as e:
         return False, f"Error migrating {filename}.md: {str(e)}"
@@ -146,8 +213,15 @@ def main():
     # Create destination if needed
     dest_dir.mkdir(parents=True, exist_ok=True)
 
-    # Find all YYYY-MM.md files
-    md_files = sorted(source_dir.glob('????-??.md'))
+    # Find all YYYY-MM.md files (one directory listing; names are matched
+    # without a stat per entry, which is a round trip on network shares)
+    with os.scandir(source_dir) as entries:
+        md_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.endswith('.md')
+            and FILENAME_RE.match(entry.name[:-3])
+            and entry.is_file()
+        )
 
     if not md_files:
         print(f"No YYYY-MM.md files found in {source_dir}")
@@ -159,15 +233,17 @@ def main():
     success_count = 0
     fail_count = 0
 
-    for source_file in md_files:
-        success, message = migrate_file(source_file, dest_dir)
-        status = '[OK]' if success else '[FAIL]'
-        print(f"{status} {message}")
-
-        if success:
-            success_count += 1
-        else:
-            fail_count += 1
+    # Files are independent (one destination each) and the work is I/O
+    # bound, so overlap the reads/writes; results are reported in order
+    with ThreadPoolExecutor() as executor:
+        for success, message in executor.map(lambda f: migrate_file(f, dest_dir), md_files):
+            status = '[OK]' if success else '[FAIL]'
+            print(f"{status} {message}")
+
+            if success:
+                success_count += 1
+            else:
+                fail_count += 1
 
     # Summary
     print()
@@ -0,0 +1,62 @@
+"""Tests for scripts/migrate-legacy-notes.py"""
+
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'migrate-legacy-notes.py'
+
+# The script name isn't a valid module name, so load it by path
+_spec = importlib.util.spec_from_file_location('migrate_legacy_notes', SCRIPT)
+migrate = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(migrate)
+
+
+class MigrateDuplicateEntriesTest(unittest.TestCase):
+    def migrate(self, content: str):
+        """Migrate one legacy file; return (success, message, output text)"""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / '2024-03.md'
+            source.write_text(content, encoding='utf-8')
+            success, message = migrate.migrate_file(source, Path(tmp) / 'out')
+            output = (Path(tmp) / 'out' / '2024' / '03-March.md').read_text(encoding='utf-8')
+        return success, message, output
+
+    def test_identical_entries_are_skipped(self):
+        success, message, output = self.migrate(
+            '# standup\nsame\n\n# idea x\n\n# standup\nsame\n'
+        )
+        self.assertTrue(success)
+        self.assertIn('(1 duplicate entries skipped)', message)
+        self.assertIn('skipped duplicate: # Meeting - standup', message)
+        self.assertEqual(output.count('# Meeting - standup'), 1)
+        self.assertIn('# Idea - idea x', output)
+
+    def test_comment_in_fenced_code_is_not_an_entry_boundary(self):
+        # Both notes end with the same snippet; its '# ' shell comment must
+        # not split it off as a separate (duplicate) entry
+        snippet = '```\n# install tools\nbrew install jq\n```\n'
+        success, message, output = self.migrate(
+            f'# setup laptop\nsteps:\n{snippet}\n# setup server\nother steps:\n{snippet}'
+        )
+        self.assertTrue(success)
+        self.assertNotIn('duplicate', message)
+        self.assertEqual(output.count(snippet), 2)
+        self.assertNotIn('Work - install tools', output)
+
+    def test_tilde_fence_is_tracked(self):
+        snippet = '~~~\n# same\n~~~\n'
+        _, message, output = self.migrate(f'# one\n{snippet}\n# two\n{snippet}')
+        self.assertNotIn('duplicate', message)
+        self.assertEqual(output.count(snippet), 2)
+
+    def test_fence_closes_only_on_its_own_marker(self):
+        # A ~~~ line inside a ``` block doesn't close it
+        _, _, output = self.migrate('# one\n```\n~~~\n# comment\n```\n# two\n')
+        self.assertIn('\n# comment\n', output)
+        self.assertIn('# Note - two', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Tests for plugins/productivity-suite/skills/note-taking/scripts/notes_manager.py"""
+
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPT = (Path(__file__).resolve().parent.parent / 'plugins' / 'productivity-suite' / 'skills'
+          / 'note-taking' / 'scripts' / 'notes_manager.py')
+
+_spec = importlib.util.spec_from_file_location('notes_manager', SCRIPT)
+notes_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(notes_manager)
+
+
+class IncrementalIndexTest(unittest.TestCase):
+    """add/append/replace patch the index in place; it must match a full rebuild"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        notes_dir = Path(self._tmp.name).resolve()
+
+        # Point the module at the temporary notes folder
+        for name, value in (('NOTES_DIR', notes_dir),
+                            ('INDEX_FILE', notes_dir / '.index.json'),
+                            ('LOCK_FILE', notes_dir / '.lock')):
+            original = getattr(notes_manager, name)
+            setattr(notes_manager, name, value)
+            self.addCleanup(setattr, notes_manager, name, original)
+
+        self.notes_dir = notes_dir
+        self.write_month('2024', '01-January', [
+            ('Work - deploy pipeline', 'Fixed the deploy pipeline.', '2024-01-05'),
+            ('Idea - budget tracker', 'A small budget tracker app.', '2024-01-09'),
+        ])
+        self.write_month('2024', '03-March', [
+            ('Meeting - planning sync', 'Discussed the roadmap.', '2024-03-02'),
+        ])
+        notes_manager.update_index()
+
+    def write_month(self, year: str, name: str, entries):
+        month_file = self.notes_dir / year / f'{name}.md'
+        month_file.parent.mkdir(parents=True, exist_ok=True)
+        text = f'# Notes - {name[3:]} {year}\n'
+        for heading, content, created in entries:
+            text += f'\n# {heading}\n{content}\n\n**Created:** {created}\n'
+        month_file.write_text(text, encoding='utf-8')
+
+    def read_index(self):
+        index = json.loads(notes_manager.INDEX_FILE.read_text(encoding='utf-8'))
+        del index['last_updated']
+        return index
+
+    def assertIndexMatchesRebuild(self):
+        incremental = self.read_index()
+        notes_manager.clean_index()
+        self.assertEqual(incremental, self.read_index())
+
+    def test_add_creates_new_month_file(self):
+        result = notes_manager.add_note('Work - new month entry', 'First note this month.')
+        self.assertEqual(result['status'], 'success')
+        self.assertIndexMatchesRebuild()
+
+    def test_add_to_existing_month_file(self):
+        notes_manager.add_note('Work - first', 'One.')
+        notes_manager.add_note('Work - second', 'Two.')
+        self.assertIndexMatchesRebuild()
+
+    def test_add_new_month_file_before_a_later_file(self):
+        # The current month's records belong before those of a later file
+        self.write_month('2099', '01-January', [('Idea - far future', 'Later.', '2099-01-01')])
+        notes_manager.update_index()
+        notes_manager.add_note('Work - inserted', 'Sorted between existing files.')
+        index = self.read_index()
+        self.assertEqual([record['file'] for record in index['entries']][-1],
+                         str(Path('2099') / '01-January.md'))
+        self.assertIndexMatchesRebuild()
+
+    def test_append_to_older_month(self):
+        result = notes_manager.append_to_entry('deploy pipeline', 'Rolled back on Friday.')
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['file'], str(Path('2024') / '01-January.md'))
+        self.assertIndexMatchesRebuild()
+
+    def test_replace_in_older_month_by_target_file(self):
+        result = notes_manager.replace_entry('Idea - budget tracker', 'Expanded\n\nacross several lines.',
+                                             target_file=str(Path('2024') / '01-January.md'))
+        self.assertEqual(result['status'], 'success')
+        self.assertIndexMatchesRebuild()
+
+    def test_replace_by_search(self):
+        result = notes_manager.replace_entry('planning sync', 'Short.')
+        self.assertEqual(result['status'], 'success')
+        self.assertIndexMatchesRebuild()
+
+    def test_sequence_of_writes(self):
+        notes_manager.add_note('Work - current', 'Today.')
+        notes_manager.append_to_entry('planning sync', 'Follow-up booked.')
+        notes_manager.replace_entry('Work - current', 'Enriched.', target_file=str(
+            notes_manager.get_current_month_file().relative_to(self.notes_dir)))
+        notes_manager.add_note('Idea - another', 'More.')
+        self.assertIndexMatchesRebuild()
+        self.assertEqual(self.read_index()['total_entries'], 5)
+
+    def test_search_sees_added_note(self):
+        notes_manager.add_note('Work - kubernetes upgrade', 'Upgraded the cluster.')
+        results = notes_manager.search_notes('kubernetes')
+        self.assertEqual(results[0]['heading'], 'Work - kubernetes upgrade')
+
+
+if __name__ == '__main__':
+    unittest.main()